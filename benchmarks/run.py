@@ -0,0 +1,225 @@
+"""
+Micro-benchmarks of the web server's hot paths, run from the repository root with:
+
+    micropython -m benchmarks.run                           # print ops/sec and bytes allocated per operation
+    micropython -m benchmarks.run --save baseline.json      # also record results as a baseline
+    micropython -m benchmarks.run --check baseline.json     # exit with status 1 if a benchmark got slower than the
+                                                            # baseline by more than 20% (--threshold 0.2)
+"""
+
+import gc
+import os
+import sys
+import json
+
+from miniwebserver.config import TYPE_CHECKING
+from miniwebserver.enums import MIMEType
+from miniwebserver.http import Request, Response, JSONResponse
+from miniwebserver.server import WebServer
+from miniwebserver.template import parse
+from miniwebserver.trace import ticks_diff, ticks_us
+from miniwebserver.utils import get_media_types
+from benchmarks.transport import FakeReader, FakeWriter, run_sync
+
+if TYPE_CHECKING:
+    from typing import Callable, Union
+
+DURATION_US = 500_000
+ALLOC_ITERATIONS = 10
+TEMPLATE_PATH = "_bench_template.html"
+
+REQUEST = (
+    b"GET /api/data/42?limit=10 HTTP/1.1\r\n"
+    b"Host: 192.168.1.10\r\n"
+    b"User-Agent: Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0\r\n"
+    b"Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8\r\n"
+    b"Accept-Language: en-US,en;q=0.5\r\n"
+    b"Accept-Encoding: gzip, deflate\r\n"
+    b"Connection: keep-alive\r\n"
+    b"\r\n"
+)
+ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8"
+
+
+def bench_request_parse() -> "Callable[[], None]":
+    reader = FakeReader(REQUEST)
+    buf = bytearray(2048)
+
+    def run() -> None:
+        reader.rewind()
+        run_sync(Request.get(reader, buf))  # pyright: ignore[reportArgumentType]
+
+    return run
+
+
+def bench_match_route(count: int) -> "Callable[[], None]":
+    app = WebServer()
+    for i in range(count):
+        app.get("/api/item%d/{param}" % i)(lambda param: "")
+
+    reader = FakeReader(b"GET /api/item%d/value HTTP/1.1\r\n\r\n" % (count - 1))
+    request: "Union[Request, None]" = None
+
+    async def get() -> None:
+        nonlocal request
+        request = await Request.get(reader)  # pyright: ignore[reportArgumentType]
+
+    run_sync(get())
+
+    def run() -> None:
+        _ = app.match_route(request)  # pyright: ignore[reportArgumentType]
+
+    return run
+
+
+def bench_media_types() -> "Callable[[], None]":
+    def run() -> None:
+        _ = get_media_types(ACCEPT)
+
+    return run
+
+
+def bench_template(count: int) -> "Callable[[], None]":
+    with open(TEMPLATE_PATH, "w") as file:
+        _ = file.write(
+            "<ul>\n{% for item in items %}\n<li>{{ item }}</li>\n{% endfor %}\n</ul>\n"
+        )
+
+    items = list(range(count))
+
+    def run() -> None:
+        _ = parse(TEMPLATE_PATH, items=items)
+
+    return run
+
+
+def bench_response_send(size: int) -> "Callable[[], None]":
+    response = Response.OK(b"x" * size, MIMEType.html)
+    writer = FakeWriter()
+    buf = bytearray(2048)
+
+    def run() -> None:
+        run_sync(response.send(writer, buf))  # pyright: ignore[reportArgumentType]
+
+    return run
+
+
+def bench_json_send(count: int) -> "Callable[[], None]":
+    response = JSONResponse([{"t": i, "value": i / 10} for i in range(count)])
+    writer = FakeWriter()
+    buf = bytearray(2048)
+
+    def run() -> None:
+        run_sync(response.send(writer, buf))  # pyright: ignore[reportArgumentType]
+
+    return run
+
+
+BENCHMARKS: "list[tuple[str, Callable[[], Callable[[], None]]]]" = [
+    ("request_parse", bench_request_parse),
+    ("match_route_10", lambda: bench_match_route(10)),
+    ("match_route_100", lambda: bench_match_route(100)),
+    ("match_route_1000", lambda: bench_match_route(1000)),
+    ("media_types", bench_media_types),
+    ("template_10", lambda: bench_template(10)),
+    ("template_100", lambda: bench_template(100)),
+    ("template_1000", lambda: bench_template(1000)),
+    ("response_send_4k", lambda: bench_response_send(4096)),
+    ("json_send_100", lambda: bench_json_send(100)),
+]
+
+
+def measure(run: "Callable[[], None]") -> tuple[float, "Union[int, None]"]:
+    """Return operations per second, and bytes allocated per operation when the port can tell"""
+    run()  # warm up
+
+    ops = 0
+    start = ticks_us()
+    while True:
+        run()
+        ops += 1
+        elapsed = ticks_diff(ticks_us(), start)
+        if elapsed >= DURATION_US:
+            break
+
+    allocated = None
+    if hasattr(gc, "mem_alloc"):
+        _ = gc.collect()
+        gc.disable()
+        before = gc.mem_alloc()  # pyright: ignore[reportAttributeAccessIssue]
+        for _ in range(ALLOC_ITERATIONS):
+            run()
+        allocated = (gc.mem_alloc() - before) // ALLOC_ITERATIONS  # pyright: ignore[reportAttributeAccessIssue]
+        gc.enable()
+
+    return ops * 1_000_000 / elapsed, allocated
+
+
+def main(args: list[str]) -> int:
+    save_path = check_path = None
+    threshold = 0.2
+
+    while args:
+        option = args.pop(0)
+        if option == "--save":
+            save_path = args.pop(0)
+        elif option == "--check":
+            check_path = args.pop(0)
+        elif option == "--threshold":
+            threshold = float(args.pop(0))
+        else:
+            print(__doc__)
+            return 2
+
+    baseline: dict[str, float] = {}
+    if check_path is not None:
+        with open(check_path) as file:
+            baseline = json.load(file)
+
+    results: dict[str, float] = {}
+    failed = 0
+
+    print("{0:<20} {1:>12} {2:>12}".format("benchmark", "ops/sec", "bytes/op"))
+
+    try:
+        for name, setup in BENCHMARKS:
+            ops_per_sec, allocated = measure(setup())
+            results[name] = ops_per_sec
+            _ = gc.collect()
+
+            status = ""
+            if name in baseline and ops_per_sec < baseline[name] * (1 - threshold):
+                status = "  SLOWER than baseline ({0:.1f} ops/sec)".format(
+                    baseline[name]
+                )
+                failed += 1
+
+            print(
+                "{0:<20} {1:>12.1f} {2:>12}{3}".format(
+                    name, ops_per_sec, "-" if allocated is None else allocated, status
+                )
+            )
+
+    finally:
+        try:
+            os.remove(TEMPLATE_PATH)
+        except OSError:
+            pass
+
+    if save_path is not None:
+        with open(save_path, "w") as file:
+            json.dump(results, file)
+
+    if failed:
+        print(
+            "{0} benchmark(s) regressed by more than {1}%".format(
+                failed, int(threshold * 100)
+            )
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
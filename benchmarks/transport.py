@@ -0,0 +1,68 @@
+"""In-process stand-ins for asyncio's StreamReader / StreamWriter, to benchmark without sockets"""
+
+from miniwebserver.config import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Coroutine
+
+
+class FakeReader:
+    def __init__(self, data: bytes):
+        self.data: bytes = data
+        self.position: int = 0
+
+    def rewind(self) -> None:
+        self.position = 0
+
+    async def readline(self) -> bytes:
+        end = self.data.find(b"\n", self.position)
+        end = len(self.data) if end == -1 else end + 1
+
+        line = self.data[self.position : end]
+        self.position = end
+        return line
+
+    async def readexactly(self, n: int) -> bytes:
+        if self.position + n > len(self.data):
+            raise EOFError
+
+        chunk = self.data[self.position : self.position + n]
+        self.position += n
+        return chunk
+
+    async def read(self, n: int = -1) -> bytes:
+        end = len(self.data) if n < 0 else min(len(self.data), self.position + n)
+
+        chunk = self.data[self.position : end]
+        self.position = end
+        return chunk
+
+
+class FakeWriter:
+    """Discards written data, only counting its size"""
+
+    def __init__(self):
+        self.written: int = 0
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        self.written += len(data)
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+def run_sync(coroutine: "Coroutine[Any, Any, Any]") -> None:
+    """Run a coroutine which never suspends (fake transports never block) without an event loop"""
+    try:
+        coroutine.send(None)
+
+    except StopIteration:
+        return
+
+    raise RuntimeError("Coroutine suspended, it cannot be run synchronously")
@@ -0,0 +1,3 @@
+# Freeze MiniWebServer into a MicroPython firmware, by adding to the board's manifest:
+#     include("path/to/miniwebserver/manifest.py")
+package("miniwebserver")  # pyright: ignore[reportUndefinedVariable]
@@ -1,6 +1,6 @@
 from miniwebserver.server import WebServer
 from miniwebserver.enums import MIMEType, Code, Header
-from miniwebserver.http import Request, Response, Version
+from miniwebserver.http import Request, Response, JSONResponse, Version
 from miniwebserver.utils import File, html_document
 
 __all__ = [
@@ -10,6 +10,7 @@ __all__ = [
     "Header",
     "Request",
     "Response",
+    "JSONResponse",
     "Version",
     "File",
     "html_document",
@@ -0,0 +1,101 @@
+import json
+import asyncio
+
+from miniwebserver.config import TYPE_CHECKING
+from miniwebserver.enums import Code, Header, MIMEType
+from miniwebserver.http import Response, Version
+
+if TYPE_CHECKING:
+    from typing import Union
+
+_MAGIC = b"MWSB"
+
+
+class AssetBundle:
+    """
+    Static files packed in a single file by tools/pack_assets.py, served from one open file handle.
+    The index maps paths to [offset, length, extension, etag, gzip offset, gzip length].
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+
+        header = self.file.read(8)
+        if header[:4] != _MAGIC:
+            self.file.close()
+            raise ValueError("{0} is not an asset bundle".format(path))
+
+        index_length = int.from_bytes(header[4:8], "little")
+        self.index: dict[str, list[int | str]] = json.loads(
+            self.file.read(index_length)
+        )
+        self.data_start: int = 8 + index_length
+
+    def find(self, *paths: str) -> Union[tuple[str, list[int | str]], None]:
+        for path in paths:
+            entry = self.index.get(path)
+            if entry is not None:
+                return path, entry
+
+        return None
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class BundleResponse(Response):
+    def __init__(
+        self,
+        bundle: AssetBundle,
+        offset: int,
+        length: int,
+        mime_type: MIMEType,
+        etag: bytes,
+        gzipped: bool = False,
+    ):
+        headers: dict[Header, bytes] = {
+            Header.ContentLength: b"%d" % length,
+            Header.ETag: etag,
+            Header.Connection: Header.ConnectionV.KeepAlive,
+        }
+
+        if mime_type != MIMEType.NONE:
+            headers[Header.ContentType] = mime_type  # pyright: ignore[reportArgumentType]
+
+        if gzipped:
+            headers[Header.ContentEncoding] = Header.ContentEncodingV.Gzip
+
+        super().__init__(Version(1, 1), Code.s200, headers, b"")
+        self.bundle: AssetBundle = bundle
+        self.offset: int = bundle.data_start + offset
+        self.length: int = length
+
+    def can_compress(self, min_size: int) -> bool:
+        return False
+
+    async def send(
+        self,
+        writer: asyncio.StreamWriter,
+        buf: Union[bytearray, None] = None,
+        encoding: Union[bytes, None] = None,
+        wbits: int = 0,
+    ) -> None:
+        if buf is None:
+            buf = bytearray(2048)
+
+        await self._send_head(writer, buf)
+
+        file = self.bundle.file
+        view = memoryview(buf)
+        sent = 0
+
+        while sent < self.length:
+            # the file handle is shared by all connections: seek before every read, with no await in between
+            _ = file.seek(self.offset + sent)
+            n = file.readinto(view[: min(len(buf), self.length - sent)])
+            if not n:
+                raise OSError("Asset bundle is truncated")
+
+            writer.write(view[:n])
+            await writer.drain()
+            sent += n
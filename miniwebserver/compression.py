@@ -0,0 +1,85 @@
+import io
+from micropython import const
+
+from miniwebserver.config import TYPE_CHECKING
+from miniwebserver.enums import Header
+from miniwebserver.utils import accepts_encoding
+
+if TYPE_CHECKING:
+    from typing import Union
+    from miniwebserver.http import Request, Response
+
+try:
+    import deflate
+
+except ImportError:
+    # Unix port / CPython, compressing with zlib instead
+    deflate = None
+
+_MIN_SIZE = const(512)
+_WBITS = const(10)
+
+
+class _ZlibCompressor(io.IOBase):
+    def __init__(self, stream: io.IOBase, encoding: bytes, wbits: int):
+        import zlib
+
+        wbits = max(wbits, 9)
+        self.stream: io.IOBase = stream
+        self.compressor = zlib.compressobj(
+            6,
+            zlib.DEFLATED,
+            wbits + 16 if encoding == Header.ContentEncodingV.Gzip else wbits,
+        )
+
+    def write(self, data: str | bytes | memoryview) -> int:
+        if isinstance(data, str):
+            data = data.encode()
+
+        _ = self.stream.write(self.compressor.compress(data))
+        return len(data)
+
+    def close(self) -> None:
+        _ = self.stream.write(self.compressor.flush())
+
+
+def compressor(stream: io.IOBase, encoding: bytes, wbits: int) -> io.IOBase:
+    """Writable stream compressing the data written to it into `stream`, call close() to flush"""
+    if deflate is None:
+        return _ZlibCompressor(stream, encoding, wbits)
+
+    return deflate.DeflateIO(
+        stream,
+        deflate.GZIP if encoding == Header.ContentEncodingV.Gzip else deflate.ZLIB,
+        wbits,
+    )
+
+
+def negotiate(accept_encoding: bytes) -> Union[bytes, None]:
+    """Encoding to compress with, gzip being preferred when the client accepts both"""
+    for encoding in (Header.ContentEncodingV.Gzip, Header.ContentEncodingV.Deflate):
+        if accepts_encoding(accept_encoding, encoding):
+            return encoding
+
+    return None
+
+
+class Compression:
+    """
+    On-the-fly compression of dynamic responses, for clients accepting gzip or deflate encodings.
+    Bodies smaller than `min_size` bytes are sent as is. The compressor's window is 2**`wbits` bytes.
+    """
+
+    def __init__(self, min_size: int = _MIN_SIZE, wbits: int = _WBITS):
+        self.min_size: int = min_size
+        self.wbits: int = wbits
+
+    def select(self, request: "Request", response: "Response") -> Union[bytes, None]:
+        """
+        Encoding to send `response` with to the client of `request`, if any.
+        Responses may be sent to several clients, so the encoding is passed to `Response.send` rather than stored.
+        """
+        if not response.can_compress(self.min_size):
+            return None
+
+        return negotiate(request.headers.get(Header.AcceptEncoding, b""))
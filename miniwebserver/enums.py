@@ -14,6 +14,7 @@ class MIMEType(Enum):
     css = const(b"text/css; charset=utf-8")
     js = const(b"text/javascript; charset=utf-8")
     json = const(b"application/json; charset=utf-8")
+    event_stream = const(b"text/event-stream; charset=utf-8")
     ico = const(b"image/x-icon")
 
     @staticmethod
@@ -67,14 +68,33 @@ class Method(Enum):
 
 class Header(Enum):
     Accept = const(b"Accept")
+    AcceptEncoding = const(b"Accept-Encoding")
+    CacheControl = const(b"Cache-Control")
+
+    class CacheControlV:
+        NoCache: bytes = const(b"no-cache")
+
     Connection = const(b"Connection")
 
     class ConnectionV:
         KeepAlive: bytes = const(b"keep-alive")
 
     ContentType = const(b"Content-Type")
+    ContentEncoding = const(b"Content-Encoding")
+
+    class ContentEncodingV:
+        Gzip: bytes = const(b"gzip")
+        Deflate: bytes = const(b"deflate")
+
+    Cookie = const(b"Cookie")
     ContentLength = const(b"Content-Length")
+    ETag = const(b"ETag")
+    IfNoneMatch = const(b"If-None-Match")
     TransferEncoding = const(b"Transfer-Encoding")
+    Vary = const(b"Vary")
+
+    class VaryV:
+        AcceptEncoding: bytes = const(b"Accept-Encoding")
 
     class TransferEncodingV:
         Chunked: bytes = const(b"chunked")
@@ -1,5 +1,5 @@
 from miniwebserver.http.request import Request
-from miniwebserver.http.response import Response
+from miniwebserver.http.response import Response, JSONResponse
 from miniwebserver.http.version import Version
 
-__all__ = ["Request", "Response", "Version"]
+__all__ = ["Request", "Response", "JSONResponse", "Version"]
@@ -1,35 +1,164 @@
 import io
-import json
 import asyncio
+from micropython import const
 
 from miniwebserver.config import TYPE_CHECKING
 from miniwebserver.http.version import Version, get_version
 from miniwebserver.enums import Header, Method
+from miniwebserver.utils import parse_pairs
 
 if TYPE_CHECKING:
     from typing import Any, Union
+    from miniwebserver.trace import RequestTrace
+
+_BODY_BUFFER_LIMIT = const(2048)
+_BODY_READ_SIZE = const(256)
+_BODY_TIMEOUT = const(5)
+
+
+class _BodyStream(io.IOBase):
+    """
+    Readable stream over a request body still pending in the socket, for routes registered with `stream=True`.
+    Route callbacks are synchronous, so reads block the event loop until data arrives or `_BODY_TIMEOUT` expires.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, length: int):
+        self.reader: asyncio.StreamReader = reader
+        self.remaining: int = length
+        self.buf: bytearray = bytearray(_BODY_READ_SIZE)
+        self.start: int = 0
+        self.end: int = 0
+
+    def _fill(self) -> None:
+        sock = self.reader.s  # pyright: ignore[reportAttributeAccessIssue]
+        sock.settimeout(_BODY_TIMEOUT)
+        try:
+            n = sock.readinto(
+                memoryview(self.buf)[: min(_BODY_READ_SIZE, self.remaining)]
+            )
+
+        finally:
+            sock.setblocking(False)
+
+        if not n:
+            raise OSError("Connection closed while reading request body")
+
+        self.remaining -= n
+        self.start, self.end = 0, n
+
+    def readinto(self, buf: bytearray | memoryview) -> int:
+        if self.start == self.end:
+            if not self.remaining:
+                return 0
+            self._fill()
+
+        n = min(len(buf), self.end - self.start)
+        buf[:n] = memoryview(self.buf)[self.start : self.start + n]
+        self.start += n
+        return n
+
+    def read(self, size: int = -1) -> bytes | bytearray:
+        if size < 0:
+            size = self.remaining + self.end - self.start
+
+        data = bytearray(size)
+        view = memoryview(data)
+        read = 0
+
+        while read < size:
+            n = self.readinto(view[read:])
+            if not n:
+                break
+            read += n
+
+        # the buffer is returned as is, only a body cut short by the client is copied
+        return data if read == size else data[:read]
+
+    async def read_all(self) -> bytes:
+        """Read the rest of the body without blocking the event loop"""
+        head = bytes(memoryview(self.buf)[self.start : self.end])
+        self.start = self.end
+
+        if not self.remaining:
+            return head
+
+        tail = await self.reader.readexactly(self.remaining)
+        self.remaining = 0
+        return head + tail if head else tail
+
+    async def forward(self, writer: Union[asyncio.StreamWriter, None]) -> None:
+        """Send the rest of the body to `writer`, or skip it when `writer` is None"""
+        if writer is not None and self.start < self.end:
+            writer.write(memoryview(self.buf)[self.start : self.end])
+
+        self.start = self.end
+        while self.remaining:
+            chunk = await self.reader.readexactly(min(_BODY_READ_SIZE, self.remaining))
+            self.remaining -= len(chunk)
+
+            if writer is not None:
+                writer.write(chunk)
+                await writer.drain()
 
 
 class Request:
+    __slots__ = (
+        "method",
+        "path",
+        "query_string",
+        "target",
+        "version",
+        "_raw_headers",
+        "_headers",
+        "_query",
+        "_cookies",
+        "_body",
+        "_stream",
+    )
+
     def __init__(
         self,
         method: Method,
         path: str,
         version: Version,
-        headers: dict[Header, bytes],
+        headers: bytes | memoryview | dict[Header, bytes],
         body: bytes = b"",
+        stream: Union[_BodyStream, None] = None,
+        query_string: str = "",
+        target: bytes = b"",
     ):
         self.method: Method = method
         self.path: str = path
+        self.query_string: str = query_string
+        # request target as received, before the query string and trailing slash are removed from `path`
+        self.target: bytes = (
+            target or (path + ("?" + query_string if query_string else "")).encode()
+        )
         self.version: Version = version
-        self.headers: dict[Header, bytes] = headers
-        self.body: bytes = body
+        self._headers: Union[dict[Header, bytes], None] = None
+
+        if isinstance(headers, dict):
+            # already parsed headers, as taken by earlier versions
+            self._headers = headers
+            headers = b"".join(
+                b"%s: %s\r\n" % (name, value) for name, value in headers.items()
+            )
+
+        self._raw_headers: bytes | memoryview = headers
+        self._query: Union[dict[str, str], None] = None
+        self._cookies: Union[dict[str, str], None] = None
+        self._body: bytes | bytearray = body
+        self._stream: Union[_BodyStream, None] = stream
 
     def __repr__(self) -> str:
         buf = io.StringIO()
         print(
-            "Request <{0} {1} HTTP/{2}.{3}>".format(
-                self.method, self.path, self.version.major, self.version.minor
+            "Request <{0} {1}{2} HTTP/{3}.{4}>".format(
+                self.method,
+                self.path,
+                "?" + self.query_string if self.query_string else "",
+                self.version.major,
+                self.version.minor,
             ),
             file=buf,
         )
@@ -43,45 +172,176 @@ class Request:
         return r
 
     @classmethod
-    async def get(cls, reader: asyncio.StreamReader) -> Union["Request", None]:
+    async def get(
+        cls,
+        reader: asyncio.StreamReader,
+        buf: Union[bytearray, None] = None,
+        trace: Union["RequestTrace", None] = None,
+    ) -> Union["Request", None]:
+        """
+        Read the next request from the connection.
+        The raw header block is stored in `buf` when given, so the returned Request is only valid until `buf` gets
+        reused.
+        """
         line = await reader.readline()
 
         if line == b"":
             return None
 
-        method_, path, version = line.split()
+        return await cls.parse(line, reader, buf, trace)
+
+    @classmethod
+    async def parse(
+        cls,
+        line: bytes,
+        reader: asyncio.StreamReader,
+        buf: Union[bytearray, None] = None,
+        trace: Union["RequestTrace", None] = None,
+    ) -> Union["Request", None]:
+        """Read the rest of the request starting with the request `line`, see `get`"""
+        if trace is not None:
+            trace.begin()
+
+        method_, target, version = line.split()
 
         method = Method.match(method_)
         if method is None:
             return None
 
-        path = path.decode()
+        path, _, query_string = target.decode().partition("?")
 
-        parsed_headers: dict[Header, bytes] = {}
+        # headers are only parsed when accessed, except for the Content-Length needed to read the body
+        raw_headers = bytearray() if buf is None else buf
+        size = 0
+        content_len = 0
 
         while True:
             line = await reader.readline()
-            line = line.strip()
-            if line:
-                name, value = line.split(b": ")
-                parsed_headers[name] = value  # pyright: ignore[reportArgumentType]
+            if not line.strip():
+                break
+
+            if line[:15].lower() == b"content-length:":
+                content_len = int(line[15:])
+
+            if size + len(line) > len(raw_headers):
+                if raw_headers is buf:
+                    # header block larger than the pooled buffer, fall back to a dedicated one
+                    raw_headers = bytearray(raw_headers[:size])
+                raw_headers.extend(line)
 
             else:
-                break
+                raw_headers[size : size + len(line)] = line
+
+            size += len(line)
+
+        body = b""
+        stream = None
+
+        if content_len > _BODY_BUFFER_LIMIT:
+            # large bodies are left in the socket until the route is known, see `WebServer._respond`
+            stream = _BodyStream(reader, content_len)
 
-        if content_len := int(parsed_headers.get(Header.ContentLength, 0)):
+        elif content_len:
             body = await reader.readexactly(content_len)
 
-        else:
-            body = b""
+        if trace is not None:
+            trace.mark("parse")
 
         return Request(
             method,
             "/" if path == "/" else path.rstrip("/"),
             get_version(version),
-            parsed_headers,
+            memoryview(raw_headers)[:size],
             body,
+            stream,
+            query_string,
+            target,
         )
 
+    @property
+    def body_pending(self) -> bool:
+        """Whether the body was left in the connection and was not read yet"""
+        return self._stream is not None
+
+    @property
+    def raw_headers(self) -> bytes | memoryview:
+        return self._raw_headers
+
+    @property
+    def headers(self) -> dict[Header, bytes]:
+        if self._headers is None:
+            # only cache the headers once all lines are parsed
+            headers: dict[Header, bytes] = {}
+
+            for line in bytes(self._raw_headers).split(b"\n"):
+                name, colon, value = line.partition(b":")
+                name = name.strip()
+                if name and colon:
+                    headers[name] = value.strip()  # pyright: ignore[reportArgumentType]
+
+            self._headers = headers
+
+        return self._headers
+
+    @property
+    def query(self) -> dict[str, str]:
+        if self._query is None:
+            self._query = parse_pairs(self.query_string, "&")
+
+        return self._query
+
+    @property
+    def cookies(self) -> dict[str, str]:
+        if self._cookies is None:
+            self._cookies = parse_pairs(
+                self.headers.get(Header.Cookie, b"").decode(), ";", plus=False
+            )
+
+        return self._cookies
+
+    @property
+    def body(self) -> bytes | bytearray:
+        if self._stream is not None:
+            self._body = self._stream.read()
+            self._stream = None
+
+        return self._body
+
+    async def read_body(self) -> None:
+        """Read a body left pending in the connection, so that `body` doesn't have to block"""
+        if self._stream is not None:
+            self._body = await self._stream.read_all()
+            self._stream = None
+
+    async def discard_body(self) -> None:
+        """Skip the part of the body that was not read by the route callback, to keep the connection usable"""
+        if self._stream is not None:
+            await self._stream.forward(None)
+            self._stream = None
+
+    async def forward_body(self, writer: asyncio.StreamWriter) -> None:
+        """Send the body to `writer`, without buffering it whole when it is still pending in the connection"""
+        if self._stream is not None:
+            await self._stream.forward(writer)
+            self._stream = None
+
+        elif len(self._body):
+            writer.write(self._body)
+            await writer.drain()
+
     def json(self) -> dict[str, "Any"]:
+        import json
+
         return json.loads(self.body)
+
+    def json_stream(self) -> dict[str, "Any"]:
+        """
+        Parse the JSON body directly from the connection, without buffering it first.
+        Only bodies of routes registered with `stream=True` are still pending in the connection when the callback runs.
+        """
+        import json
+
+        if self._stream is None:
+            return json.loads(self._body)
+
+        return json.load(self._stream)  # pyright: ignore[reportArgumentType]
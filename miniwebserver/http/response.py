@@ -2,13 +2,66 @@ import asyncio
 import io
 from micropython import const
 
+from miniwebserver.config import TYPE_CHECKING
 from miniwebserver.http.version import Version
 from miniwebserver.enums import FILE_MARKER, Code, Header, MIMEType
 
+if TYPE_CHECKING:
+    from typing import Any, Iterator, Union
+
 _WRITE_BUF_SIZE = const(2048)
 
 
+def write_chunk(
+    writer: asyncio.StreamWriter, chunk: bytes | bytearray | memoryview
+) -> None:
+    # Send the size of the chunk in hexadecimal, followed by the chunk itself
+    writer.write(b"%X\r\n" % len(chunk))
+    writer.write(chunk)
+    writer.write(b"\r\n")
+
+
+async def end_chunks(writer: asyncio.StreamWriter) -> None:
+    writer.write(b"0\r\n\r\n")  # Send the zero-length chunk to indicate end
+    await writer.drain()
+
+
+class ChunkedStream(io.IOBase):
+    """Writable stream sending the data written to it as HTTP chunks of at most `len(buf)` bytes"""
+
+    def __init__(
+        self, writer: asyncio.StreamWriter, buf: Union[bytearray, None] = None
+    ):
+        self.writer: asyncio.StreamWriter = writer
+        self.buf: bytearray = bytearray(_WRITE_BUF_SIZE) if buf is None else buf
+        self.size: int = 0
+
+    def write(self, data: str | bytes) -> int:
+        if isinstance(data, str):
+            data = data.encode()
+
+        length = len(data)
+        if self.size + length > len(self.buf):
+            self.flush()
+
+        if length >= len(self.buf):
+            write_chunk(self.writer, data)
+
+        else:
+            self.buf[self.size : self.size + length] = data
+            self.size += length
+
+        return length
+
+    def flush(self) -> None:
+        if self.size:
+            write_chunk(self.writer, memoryview(self.buf)[: self.size])
+            self.size = 0
+
+
 class Response:
+    buffered: bool = True
+
     def __init__(
         self,
         version: Version,
@@ -20,6 +73,7 @@ class Response:
         self.status_code: Code = status_code
         self.headers: dict[Header, bytes] = headers
         self.body: bytes = body
+        self.compressible: bool = False
 
     def __repr__(self) -> str:
         buf = io.StringIO(
@@ -72,56 +126,225 @@ class Response:
             body,
         )
 
-    async def send(self, writer: asyncio.StreamWriter) -> None:
-        writer.write(
-            b"HTTP/%d.%d %d %s\r\n"
-            % (
-                self.version.major,
-                self.version.minor,
-                Code.get_value(self.status_code),
-                self.status_code,
-            )
+    def can_compress(self, min_size: int) -> bool:
+        return (
+            self.compressible
+            and len(self.body) >= min_size
+            and not self.body.startswith(FILE_MARKER)
+        )
+
+    def _head_parts(self, encoding: Union[bytes, None] = None) -> "Iterator[bytes]":
+        yield b"HTTP/%d.%d %d %s\r\n" % (
+            self.version.major,
+            self.version.minor,
+            Code.get_value(self.status_code),
+            self.status_code,
         )
 
         for header, value in self.headers.items():
-            writer.write(b"%s: %s\r\n" % (header, value))
+            if encoding is not None and header in (
+                Header.ContentLength,
+                Header.TransferEncoding,
+            ):
+                continue
 
-        writer.write(b"\r\n")
-        await writer.drain()
+            yield header  # pyright: ignore[reportReturnType]
+            yield b": "
+            yield value if isinstance(value, bytes) else str(value).encode()
+            yield b"\r\n"
+
+        if encoding is not None:
+            # the compressed size is unknown, the body is sent in chunks
+            yield (
+                b"Transfer-Encoding: chunked\r\nContent-Encoding: %s\r\nVary: Accept-Encoding\r\n"
+                % encoding
+            )
+
+        yield b"\r\n"
+
+    async def _send_head(
+        self,
+        writer: asyncio.StreamWriter,
+        buf: Union[bytearray, None] = None,
+        encoding: Union[bytes, None] = None,
+    ) -> None:
+        """
+        Send the status line and headers, gathered in `buf` to send them with as few writes as possible.
+        With an `encoding`, the headers describe the body compressed with it.
+        """
+        if buf is None:
+            buf = bytearray(_WRITE_BUF_SIZE)
+
+        view = memoryview(buf)
+        size = 0
+
+        for part in self._head_parts(encoding):
+            length = len(part)
+            if size + length > len(buf):
+                writer.write(view[:size])
+                size = 0
+
+            if length > len(buf):
+                writer.write(part)
 
-        if len(self.body):
-            if self.body.startswith(FILE_MARKER):
-                data = open(self.body[6:], "rb")
             else:
-                data = io.BytesIO(self.body)
-
-            try:
-                if (
-                    self.headers.get(Header.TransferEncoding)
-                    == Header.TransferEncodingV.Chunked
-                ):
-                    chunk = data.read(_WRITE_BUF_SIZE)
-                    while chunk:
-                        # Send the size of the chunk in hexadecimal, followed by the chunk itself
-                        writer.write(b"%X\r\n" % len(chunk))
-                        writer.write(chunk)
-                        writer.write(b"\r\n")
-
-                        chunk = data.read(_WRITE_BUF_SIZE)
-                        await writer.drain()
-
-                    writer.write(
-                        b"0\r\n\r\n"
-                    )  # Send the zero-length chunk to indicate end
+                buf[size : size + length] = part
+                size += length
+
+        writer.write(view[:size])
+        await writer.drain()
+
+    async def send(
+        self,
+        writer: asyncio.StreamWriter,
+        buf: Union[bytearray, None] = None,
+        encoding: Union[bytes, None] = None,
+        wbits: int = 0,
+    ) -> None:
+        if buf is None:
+            buf = bytearray(_WRITE_BUF_SIZE)
+
+        await self._send_head(writer, buf, encoding)
+
+        if encoding is not None:
+            from miniwebserver.compression import compressor
+
+            stream = ChunkedStream(writer, buf)
+            target = compressor(stream, encoding, wbits)
+            view = memoryview(self.body)
+
+            for start in range(0, len(self.body), _WRITE_BUF_SIZE):
+                _ = target.write(view[start : start + _WRITE_BUF_SIZE])
+                await writer.drain()
+
+            target.close()
+            stream.flush()
+            await end_chunks(writer)
+            return
+
+        if not len(self.body):
+            return
+
+        chunked = (
+            self.headers.get(Header.TransferEncoding)
+            == Header.TransferEncodingV.Chunked
+        )
+        if not chunked:
+            # determine length from the Content-Length
+            assert self.headers.get(Header.ContentLength) is not None, (
+                "No Content-Length defined"
+            )
+
+        if self.body.startswith(FILE_MARKER):
+            view = memoryview(buf)
+
+            with open(self.body[6:], "rb") as file:
+                n = file.readinto(buf)
+                while n:
+                    if chunked:
+                        write_chunk(writer, view[:n])
+                    else:
+                        writer.write(view[:n])
+
                     await writer.drain()
+                    n = file.readinto(buf)
+
+        else:
+            view = memoryview(self.body)
 
+            for start in range(0, len(self.body), len(buf)):
+                if chunked:
+                    write_chunk(writer, view[start : start + len(buf)])
                 else:
-                    # determine length from the Content-Length
-                    assert self.headers.get(Header.ContentLength) is not None, (
-                        "No Content-Length defined"
-                    )
-                    writer.write(data.read())
-                    await writer.drain()
+                    writer.write(view[start : start + len(buf)])
+
+                await writer.drain()
+
+        if chunked:
+            await end_chunks(writer)
+
+
+class JSONResponse(Response):
+    """
+    Response serializing an object to JSON directly into the connection, as chunks.
+    Top-level lists and dicts are serialized item by item, waiting for the client to receive the data in between so
+    that the full JSON document never needs to be held in memory.
+    """
+
+    def __init__(self, obj: "Any"):
+        super().__init__(
+            Version(1, 1),
+            Code.s200,
+            {
+                Header.ContentType: MIMEType.json,  # pyright: ignore[reportArgumentType]
+                Header.TransferEncoding: Header.TransferEncodingV.Chunked,
+                Header.Connection: Header.ConnectionV.KeepAlive,
+            },
+            b"",
+        )
+        self.obj: "Any" = obj
+
+    def can_compress(self, min_size: int) -> bool:
+        # the serialized size is only known once sent: lists and dicts are compressed, other values are too short
+        return (
+            self.compressible
+            and isinstance(self.obj, (list, tuple, dict))
+            and len(self.obj) > 0
+        )
+
+    async def send(
+        self,
+        writer: asyncio.StreamWriter,
+        buf: Union[bytearray, None] = None,
+        encoding: Union[bytes, None] = None,
+        wbits: int = 0,
+    ) -> None:
+        import json
+
+        await self._send_head(writer, buf, encoding)
+
+        chunked_stream = ChunkedStream(writer, buf)
+        stream = chunked_stream
+
+        if encoding is not None:
+            from miniwebserver.compression import compressor
+
+            stream = compressor(chunked_stream, encoding, wbits)
+
+        obj = self.obj
+
+        if isinstance(obj, (list, tuple)):
+            _ = stream.write(b"[")
+            for index, item in enumerate(obj):
+                if index:
+                    _ = stream.write(b",")
+                json.dump(item, stream)
+                await writer.drain()
+
+            _ = stream.write(b"]")
+
+        elif isinstance(obj, dict):
+            _ = stream.write(b"{")
+            for index, (key, value) in enumerate(obj.items()):
+                if index:
+                    _ = stream.write(b",")
+                if not isinstance(key, str):
+                    # same conversion as json.dumps for non-string keys: 1 -> "1", True -> "true", None -> "null"
+                    if key is not None and not isinstance(key, (int, float)):
+                        raise TypeError("keys must be str, int, float, bool or None")
+                    key = json.dumps(key)
+                json.dump(key, stream)
+                _ = stream.write(b":")
+                json.dump(value, stream)
+                await writer.drain()
+
+            _ = stream.write(b"}")
+
+        else:
+            json.dump(obj, stream)
+
+        if stream is not chunked_stream:
+            stream.close()
 
-            finally:
-                data.close()
+        chunked_stream.flush()
+        await end_chunks(writer)
@@ -0,0 +1,49 @@
+from micropython import const
+
+_BUFFER_SIZE = const(2048)
+_POOL_SIZE = const(4)
+
+
+class BufferPool:
+    """
+    Fixed set of `bytearray` buffers shared by all connections, to keep the allocation pattern flat.
+    When all buffers are checked out, a new one is allocated and the exhaustion is counted in `stats()`.
+    """
+
+    def __init__(self, count: int = _POOL_SIZE, size: int = _BUFFER_SIZE):
+        self.count: int = count
+        self.size: int = size
+        self.free: list[bytearray] = [bytearray(size) for _ in range(count)]
+        self.in_use: int = 0
+        self.peak: int = 0
+        self.exhausted: int = 0
+
+    def checkout(self) -> bytearray:
+        if self.free:
+            buf = self.free.pop()
+
+        else:
+            self.exhausted += 1
+            buf = bytearray(self.size)
+
+        self.in_use += 1
+        if self.in_use > self.peak:
+            self.peak = self.in_use
+
+        return buf
+
+    def release(self, buf: bytearray) -> None:
+        self.in_use -= 1
+
+        if len(self.free) < self.count:
+            self.free.append(buf)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "count": self.count,
+            "size": self.size,
+            "free": len(self.free),
+            "in_use": self.in_use,
+            "peak": self.peak,
+            "exhausted": self.exhausted,
+        }
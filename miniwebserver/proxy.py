@@ -0,0 +1,268 @@
+import asyncio
+from micropython import const
+
+from miniwebserver.config import TYPE_CHECKING
+from miniwebserver.enums import Code
+from miniwebserver.http import Request, Response, Version
+
+if TYPE_CHECKING:
+    from typing import Union
+
+    Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+_POOL_SIZE = const(4)
+_TIMEOUT = const(5)
+
+
+class UpstreamError(Exception):
+    pass
+
+
+class UpstreamPool:
+    """
+    Bounded pool of keep-alive connections to an upstream server.
+    At most `size` connections are open at once, requests wait up to `timeout` seconds for one to be available.
+    """
+
+    def __init__(
+        self, host: str, port: int, size: int = _POOL_SIZE, timeout: int = _TIMEOUT
+    ):
+        self.host: str = host
+        self.port: int = port
+        self.size: int = size
+        self.timeout: int = timeout
+        self.idle: list["Connection"] = []
+        self.open: int = 0
+        self.released: asyncio.Event = asyncio.Event()
+
+    async def acquire(self) -> tuple["Connection", bool]:
+        """Get a connection, and whether it was reused from an earlier request"""
+        while True:
+            if self.idle:
+                return self.idle.pop(), True
+
+            if self.open < self.size:
+                self.open += 1
+                try:
+                    connection = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port), self.timeout
+                    )
+
+                except BaseException:
+                    self.open -= 1
+                    raise
+
+                return connection, False
+
+            self.released.clear()
+            await asyncio.wait_for(self.released.wait(), self.timeout)
+
+    def release(self, connection: "Connection", reusable: bool) -> None:
+        if reusable:
+            self.idle.append(connection)
+
+        else:
+            self.open -= 1
+            connection[1].close()
+
+        self.released.set()
+
+
+class ProxyResponse(Response):
+    """Response forwarded from an upstream server, streamed back to the client as it arrives"""
+
+    def __init__(self, pool: UpstreamPool, request: Request):
+        super().__init__(Version(1, 1), Code.s200, {}, b"")
+        self.pool: UpstreamPool = pool
+        self.request: Request = request
+
+    def can_compress(self, min_size: int) -> bool:
+        return False
+
+    async def send(
+        self,
+        writer: asyncio.StreamWriter,
+        buf: Union[bytearray, None] = None,
+        encoding: Union[bytes, None] = None,
+        wbits: int = 0,
+    ) -> None:
+        if buf is None:
+            buf = bytearray(2048)
+
+        try:
+            connection, response = await self._connect()
+
+        except asyncio.TimeoutError:
+            await Response.empty(Code.e504).send(writer, buf)
+            return
+
+        except (OSError, UpstreamError, ValueError):
+            await Response.empty(Code.e502).send(writer, buf)
+            return
+
+        # from here on, the client already received part of the response: errors close both connections
+        reusable = False
+        try:
+            reusable = await self._relay(connection, response, writer, buf)
+
+        finally:
+            self.pool.release(connection, reusable)
+
+    async def _connect(self) -> tuple["Connection", tuple[int, list[bytes]]]:
+        """Send the request upstream, on a new connection if a reused one turns out to be closed"""
+        while True:
+            connection, reused = await self.pool.acquire()
+            retry = reused and not self.request.body_pending
+
+            try:
+                return connection, await self._request(connection)
+
+            except Exception as err:
+                self.pool.release(connection, False)
+                if (
+                    not retry
+                    or isinstance(err, asyncio.TimeoutError)
+                    or not isinstance(err, (OSError, UpstreamError))
+                ):
+                    raise
+
+    async def _read(self, reader: asyncio.StreamReader, size: int) -> bytes:
+        data = await asyncio.wait_for(reader.read(size), self.pool.timeout)
+        if not data:
+            raise UpstreamError("Upstream connection closed")
+        return data
+
+    async def _readline(self, reader: asyncio.StreamReader) -> bytes:
+        line = await asyncio.wait_for(reader.readline(), self.pool.timeout)
+        if not line:
+            raise UpstreamError("Upstream connection closed")
+        return line
+
+    async def _request(self, connection: "Connection") -> tuple[int, list[bytes]]:
+        """Send the request upstream and return the response's status code, status line and header lines"""
+        reader, writer = connection
+        request = self.request
+
+        writer.write(b"%s %s HTTP/1.1\r\n" % (request.method, request.target))
+
+        # Connection and Keep-Alive only apply to the client's connection, the upstream one is kept open
+        for line in bytes(request.raw_headers).split(b"\n"):
+            name = line.partition(b":")[0].strip().lower()
+            if name and name != b"connection" and name != b"keep-alive":
+                writer.write(line)
+                writer.write(b"\n")
+
+        writer.write(b"Connection: keep-alive\r\n\r\n")
+        await writer.drain()
+        await request.forward_body(writer)
+
+        status_line = await self._readline(reader)
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[0].startswith(b"HTTP/"):
+            raise UpstreamError("Invalid status line from upstream server")
+
+        head = [status_line]
+        while True:
+            line = await self._readline(reader)
+            head.append(line)
+            if not line.strip():
+                return int(parts[1]), head
+
+    async def _relay(
+        self,
+        connection: "Connection",
+        response: tuple[int, list[bytes]],
+        writer: asyncio.StreamWriter,
+        buf: bytearray,
+    ) -> bool:
+        """Stream the response back to the client, return whether the upstream connection can be reused"""
+        reader = connection[0]
+        status, head = response
+
+        content_length = -1
+        chunked = False
+        # HTTP/1.0 connections are closed after the response, unless the upstream says otherwise
+        http11 = not head[0].startswith(b"HTTP/1.0")
+        keep_alive = http11
+
+        writer.write(head[0])
+
+        # the last line of the head is the empty line ending it
+        for line in head[1:-1]:
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+
+            if name == b"connection":
+                value = value.lower()
+                keep_alive = b"close" not in value and (
+                    http11 or b"keep-alive" in value
+                )
+                continue
+
+            if name == b"keep-alive":
+                continue
+
+            # Connection and Keep-Alive describe the upstream connection, everything else is relayed as is
+            writer.write(line)
+
+            if name == b"content-length":
+                content_length = int(value)
+            elif name == b"transfer-encoding":
+                chunked = b"chunked" in value.lower()
+
+        no_body = status < 200 or status in (204, 304)
+
+        if no_body or chunked or content_length >= 0:
+            writer.write(b"Connection: keep-alive\r\n\r\n")
+
+        else:
+            # the body ends when the connection closes
+            writer.write(b"Connection: close\r\n\r\n")
+
+        await writer.drain()
+
+        if no_body:
+            return keep_alive
+
+        if chunked:
+            while True:
+                size_line = await self._readline(reader)
+                writer.write(size_line)
+                size = int(size_line.split(b";")[0], 16)
+
+                if size == 0:
+                    # trailer section, ending with an empty line
+                    while True:
+                        line = await self._readline(reader)
+                        writer.write(line)
+                        if not line.strip():
+                            break
+                    await writer.drain()
+                    return keep_alive
+
+                await self._copy(reader, writer, size + 2, len(buf))
+
+        if content_length >= 0:
+            await self._copy(reader, writer, content_length, len(buf))
+            return keep_alive
+
+        # no framing: the body ends when the upstream closes the connection, which the client must see as well
+        while True:
+            data = await asyncio.wait_for(reader.read(len(buf)), self.pool.timeout)
+            if not data:
+                raise OSError("Upstream response ended by closing the connection")
+            writer.write(data)
+            await writer.drain()
+
+    async def _copy(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        length: int,
+        block_size: int,
+    ) -> None:
+        while length:
+            data = await self._read(reader, min(block_size, length))
+            writer.write(data)
+            await writer.drain()
+            length -= len(data)
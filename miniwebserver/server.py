@@ -1,19 +1,26 @@
 import os
-import re
 import gc
 import sys
 import asyncio
 
 from miniwebserver.config import TYPE_CHECKING
-from miniwebserver.utils import get_media_types, print_exception
+from miniwebserver.utils import (
+    accepts_encoding,
+    etag_matches,
+    get_media_types,
+    print_exception,
+)
 from miniwebserver.enums import Header, MIMEType, Code, FILE_MARKER, Method
-from miniwebserver.http import Request, Response
+from miniwebserver.http import Request, Response, JSONResponse
+from miniwebserver.pool import BufferPool
 
 if TYPE_CHECKING:
     from typing import Any, Callable
-
-
-BRACKETS = re.compile("[{}]")
+    from miniwebserver.bundle import AssetBundle
+    from miniwebserver.compression import Compression
+    from miniwebserver.proxy import UpstreamPool
+    from miniwebserver.sse import EventChannel
+    from miniwebserver.trace import RequestTrace, Tracer
 
 
 class WebServer:
@@ -23,29 +30,48 @@ class WebServer:
         host: str = "0.0.0.0",
         port: int = 80,
         source_folder: str = ".",
+        buffer_pool_size: int = 4,
+        buffer_size: int = 2048,
+        asset_bundle: str | None = None,
+        tracer: "Tracer | None" = None,
+        compression: "Compression | None" = None,
         **globals: "Any",
     ):
         self.host: str = host
         self.port: int = port
         self.source_folder: str = source_folder
         self.globals: dict[str, "Any"] = globals
+        self.buffer_pool: BufferPool = BufferPool(buffer_pool_size, buffer_size)
+        self.asset_bundle: "AssetBundle | None" = None
+        if asset_bundle is not None:
+            from miniwebserver.bundle import AssetBundle
 
+            self.asset_bundle = AssetBundle(asset_bundle)
+        self.tracer: "Tracer | None" = tracer
+        self.compression: "Compression | None" = compression
+
+        self.proxies: list[tuple[str, "UpstreamPool"]] = []
         self.routes: dict[
             Method,
             dict[tuple[tuple[str, ...], ...], Callable[..., Response]],
         ] = {}
+        # routes registered with `stream=True`, whose callback reads large bodies from the connection itself
+        self.streamed: set[Callable[..., Response]] = set()
+        # GET routes registered with `with_request=True`, whose callback receives the Request as first argument
+        self.with_request: set[Callable[..., Response]] = set()
 
     @staticmethod
     def _parse_path(path: str) -> tuple[tuple[str, ...], ...]:
         path = "/" if path == "/" else path.rstrip("/")
 
         return tuple(
-            tuple(BRACKETS.sub("?", part).split("?")) for part in path.split("/")
+            tuple(part.replace("{", "?").replace("}", "?").split("?"))
+            for part in path.split("/")
         )
 
     @staticmethod
     def _make_safe_callback(
-        callback: Callable[..., str | bytes], mime_type: MIMEType
+        callback: Callable[..., str | bytes], mime_type: MIMEType, compress: bool
     ) -> Callable[..., Response]:
         def inner(*args: "Any") -> Response:
             try:
@@ -54,8 +80,14 @@ class WebServer:
                     body = body.encode()
 
                 if isinstance(body, Response):
-                    return body
-                return Response.OK(body, mime_type)
+                    response = body
+                elif isinstance(body, (dict, list)):
+                    response = JSONResponse(body)
+                else:
+                    response = Response.OK(body, mime_type)
+
+                response.compressible = compress
+                return response
 
             except Exception as err:
                 return Response.InternalServerError(print_exception(err), MIMEType.html)
@@ -63,39 +95,114 @@ class WebServer:
         return inner
 
     def _register_method(
-        self, method: Method, path: str, mime_type: MIMEType
-    ) -> Callable[[Callable[..., str]], None]:
-        def inner(callback: Callable[..., str]) -> None:
-            self.routes.setdefault(method, {})[self._parse_path(path)] = (
-                self._make_safe_callback(callback, mime_type)
-            )
+        self,
+        method: Method,
+        path: str,
+        mime_type: MIMEType,
+        compress: bool = True,
+        stream: bool = False,
+        with_request: bool = False,
+    ) -> Callable[[Callable[..., Any]], None]:
+        def inner(callback: Callable[..., Any]) -> None:
+            safe_callback = self._make_safe_callback(callback, mime_type, compress)
+            self.routes.setdefault(method, {})[self._parse_path(path)] = safe_callback
+            if stream:
+                self.streamed.add(safe_callback)
+            if with_request:
+                self.with_request.add(safe_callback)
 
         return inner
 
     def get(
-        self, path: str, mime_type: MIMEType = MIMEType.html
+        self,
+        path: str,
+        mime_type: MIMEType = MIMEType.html,
+        compress: bool = True,
+        with_request: bool = False,
     ) -> Callable[[Callable[..., str]], None]:
-        return self._register_method(Method.GET, path, mime_type)
+        return self._register_method(
+            Method.GET, path, mime_type, compress, with_request=with_request
+        )
 
     def post(
-        self, path: str, mime_type: MIMEType = MIMEType.NONE
+        self,
+        path: str,
+        mime_type: MIMEType = MIMEType.NONE,
+        compress: bool = True,
+        stream: bool = False,
     ) -> Callable[[Callable[[Request], str]], None]:
-        return self._register_method(Method.POST, path, mime_type)
+        return self._register_method(Method.POST, path, mime_type, compress, stream)
 
     def put(
-        self, path: str, mime_type: MIMEType = MIMEType.NONE
+        self,
+        path: str,
+        mime_type: MIMEType = MIMEType.NONE,
+        compress: bool = True,
+        stream: bool = False,
     ) -> Callable[[Callable[..., str]], None]:
-        return self._register_method(Method.PUT, path, mime_type)
+        return self._register_method(Method.PUT, path, mime_type, compress, stream)
 
     def delete(
-        self, path: str, mime_type: MIMEType = MIMEType.NONE
+        self, path: str, mime_type: MIMEType = MIMEType.NONE, compress: bool = True
     ) -> Callable[[Callable[..., str]], None]:
-        return self._register_method(Method.DELETE, path, mime_type)
+        return self._register_method(Method.DELETE, path, mime_type, compress)
 
     def patch(
-        self, path: str, mime_type: MIMEType = MIMEType.NONE
+        self,
+        path: str,
+        mime_type: MIMEType = MIMEType.NONE,
+        compress: bool = True,
+        stream: bool = False,
     ) -> Callable[[Callable[..., str]], None]:
-        return self._register_method(Method.PATCH, path, mime_type)
+        return self._register_method(Method.PATCH, path, mime_type, compress, stream)
+
+    def sse(self, path: str) -> "Callable[[Callable[..., EventChannel]], None]":
+        """Register a Server-Sent Events route, the callback returns the EventChannel to subscribe clients to"""
+
+        from miniwebserver.sse import EventStream
+
+        def inner(callback: "Callable[..., EventChannel]") -> None:
+            def subscribe(*args: "Any") -> EventStream:
+                return EventStream(callback(*args))
+
+            self._register_method(Method.GET, path, MIMEType.event_stream)(subscribe)
+
+        return inner
+
+    def proxy(
+        self,
+        prefix: str,
+        upstream_host: str,
+        upstream_port: int,
+        *,
+        pool_size: int = 4,
+        timeout: int = 5,
+    ) -> None:
+        """
+        Forward requests for paths starting with `prefix` (path and query unchanged) to an upstream server, over at
+        most `pool_size` keep-alive connections. Upstream failures are answered with 502 Bad Gateway, and 504 Gateway
+        Timeout after `timeout` seconds without a connection or data.
+        """
+        from miniwebserver.proxy import UpstreamPool
+
+        self.proxies.append(
+            (
+                "/" if prefix == "/" else prefix.rstrip("/"),
+                UpstreamPool(upstream_host, upstream_port, pool_size, timeout),
+            )
+        )
+
+    def trace_route(self, path: str = "/debug/trace") -> None:
+        """Register a GET route listing the slow requests recorded by the tracer, as JSON"""
+        if self.tracer is None:
+            raise ValueError("No tracer was given to the web server")
+
+        tracer = self.tracer
+
+        def slow_requests() -> list[dict[str, "Any"]]:
+            return [trace.as_dict() for trace in tracer.slow_requests()]
+
+        self.get(path, MIMEType.json)(slow_requests)  # pyright: ignore[reportArgumentType]
 
     @staticmethod
     def _match_one_route(
@@ -126,9 +233,10 @@ class WebServer:
         for route in self.routes[request.method]:
             matched, args = self._match_one_route(route, req_parts)
             if matched:
-                if request.method is not Method.GET:
+                callback = self.routes[request.method][route]
+                if request.method is not Method.GET or callback in self.with_request:
                     args = (request,) + args
-                return self.routes[request.method][route], args
+                return callback, args
 
         return None, ()
 
@@ -167,45 +275,115 @@ class WebServer:
     async def _handle_client(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ) -> None:
-        while True:
-            request = await Request.get(reader)
+        tracer = self.tracer
 
-            if request is None:
-                writer.close()
-                await writer.wait_closed()
-                return
+        try:
+            while True:
+                line = await reader.readline()
+                if line == b"":
+                    return
 
-            callback, args = self.match_route(request)
-            if callback is not None:
-                response = callback(*args)
+                # idle keep-alive connections hold no pooled buffer, it is only checked out once a request arrives
+                trace = None if tracer is None else tracer.start()
+                buf: "bytearray | None" = self.buffer_pool.checkout()
+                send_buf = None
 
-            elif request.method == Method.GET:
                 try:
-                    response = self.get_media(request)
-
-                except Exception as err:
-                    response = Response.InternalServerError(
-                        print_exception(err), MIMEType.html
-                    )
-
-            elif request.method in (
-                Method.POST,
-                Method.PUT,
-                Method.DELETE,
-                Method.PATCH,
+                    request = await Request.parse(line, reader, buf, trace)
+                    if request is None:
+                        return
+
+                    response = await self._respond(request, trace)
+                    encoding, wbits = None, 0
+                    if self.compression is not None:
+                        encoding = self.compression.select(request, response)
+                        wbits = self.compression.wbits
+
+                    if response.buffered:
+                        send_buf = self.buffer_pool.checkout()
+
+                    else:
+                        # long-lived stream, which doesn't need the request headers stored in `buf` anymore
+                        self.buffer_pool.release(buf)
+                        buf = None
+
+                    try:
+                        await response.send(writer, send_buf, encoding, wbits)
+                        await request.discard_body()
+
+                        # unbuffered responses are long-lived streams, not worth tracing
+                        if trace is not None and response.buffered:
+                            trace.mark("send")
+                            tracer.finish(trace, request.method, request.path)  # pyright: ignore[reportOptionalMemberAccess]
+
+                    except Exception as err:
+                        if not isinstance(err, OSError):
+                            _ = print_exception(err)
+                        return
+
+                finally:
+                    if buf is not None:
+                        self.buffer_pool.release(buf)
+                    if send_buf is not None:
+                        self.buffer_pool.release(send_buf)
+
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def _respond(
+        self, request: Request, trace: "RequestTrace | None"
+    ) -> Response:
+        for prefix, pool in self.proxies:
+            if (
+                prefix == "/"
+                or request.path == prefix
+                or request.path.startswith(prefix + "/")
             ):
-                response = Response.empty(Code.e404)
+                from miniwebserver.proxy import ProxyResponse
 
-            else:
-                response = Response.empty(Code.e405)
+                if trace is not None:
+                    trace.mark("route")
+                return ProxyResponse(pool, request)
+
+        callback, args = self.match_route(request)
+        if trace is not None:
+            trace.mark("route")
 
+        if callback is not None:
+            if request.body_pending and callback not in self.streamed:
+                # read large bodies here rather than with blocking reads from the callback
+                await request.read_body()
+                if trace is not None:
+                    trace.mark("body")
+
+            response = callback(*args)
+            if trace is not None:
+                trace.mark("callback")
+            return response
+
+        elif request.method == Method.GET:
             try:
-                await response.send(writer)
+                response = self.get_media(request)
+
+            except Exception as err:
+                response = Response.InternalServerError(
+                    print_exception(err), MIMEType.html
+                )
+
+            if trace is not None:
+                trace.mark("media")
+            return response
 
-            except OSError:
-                writer.close()
-                await writer.wait_closed()
-                return
+        elif request.method in (
+            Method.POST,
+            Method.PUT,
+            Method.DELETE,
+            Method.PATCH,
+        ):
+            return Response.empty(Code.e404)
+
+        return Response.empty(Code.e405)
 
     def _get_asset(
         self, requested_file_name: str, sub_t: str, extension: str
@@ -237,6 +415,59 @@ class WebServer:
 
         return None
 
+    def _get_bundled_media(
+        self,
+        request: Request,
+        requested_file_name: str,
+        extension: str,
+        mime_type: MIMEType,
+    ) -> Response:
+        from miniwebserver.bundle import BundleResponse
+
+        assert self.asset_bundle is not None
+
+        found = self.asset_bundle.find(
+            requested_file_name,
+            "assets/%s" % requested_file_name,
+            "assets/%s/%s" % (extension, requested_file_name),
+        )
+        if found is None:
+            return Response.empty(Code.e404)
+
+        _, entry = found
+        offset, length = int(entry[0]), int(entry[1])
+        etag = str(entry[3]).encode()
+        gz_offset, gz_length = int(entry[4]), int(entry[5])
+
+        gzipped = bool(gz_length) and accepts_encoding(
+            request.headers.get(Header.AcceptEncoding, b""),
+            Header.ContentEncodingV.Gzip,
+        )
+        if gzipped:
+            # the compressed variant is a different representation, with its own validator
+            offset, length = gz_offset, gz_length
+            etag = etag[:-1] + b'-gz"'
+
+        if etag_matches(request.headers.get(Header.IfNoneMatch, b""), etag):
+            response = Response.empty(Code.r304)
+            response.headers[Header.ETag] = etag
+
+        else:
+            response = BundleResponse(
+                self.asset_bundle,
+                offset,
+                length,
+                mime_type,
+                etag,
+                gzipped,
+            )
+
+        if gz_length:
+            # caches must not serve one variant to clients expecting the other
+            response.headers[Header.Vary] = Header.VaryV.AcceptEncoding  # pyright: ignore[reportArgumentType]
+
+        return response
+
     def get_media(self, request: Request) -> Response:
         path = request.path
         requested_file_name = path[1:]
@@ -248,6 +479,11 @@ class WebServer:
         if mime_type is None:
             return Response.empty(Code.e415)
 
+        if self.asset_bundle is not None:
+            return self._get_bundled_media(
+                request, requested_file_name, extension, mime_type
+            )
+
         for accepted_type in get_media_types(
             request.headers.get(Header.Accept, b"*/*").decode()
         ):
@@ -0,0 +1,162 @@
+import asyncio
+from micropython import const
+
+from miniwebserver.config import TYPE_CHECKING
+from miniwebserver.enums import Code, Header, MIMEType
+from miniwebserver.http import Response, Version
+from miniwebserver.http.response import end_chunks
+
+if TYPE_CHECKING:
+    from typing import Union
+
+_MAX_PENDING = const(8)
+_HEARTBEAT = const(15)
+_HEAD_BUF_SIZE = const(256)
+
+# comment line, ignored by clients, wrapped in a single HTTP chunk
+_PING = b"8\r\n: ping\n\n\r\n"
+
+
+def format_event(
+    data: str | bytes,
+    event: Union[str, None] = None,
+    id: Union[str, None] = None,
+) -> bytes:
+    """Serialize an event to the text/event-stream format, wrapped in a single HTTP chunk"""
+    if isinstance(data, str):
+        data = data.encode()
+
+    message = b""
+    if id is not None:
+        message += b"id: %s\n" % id.encode()
+
+    if event is not None:
+        message += b"event: %s\n" % event.encode()
+
+    for line in data.split(b"\n"):
+        message += b"data: %s\n" % line
+
+    message += b"\n"
+    return b"%X\r\n%s\r\n" % (len(message), message)
+
+
+class _Subscriber:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer: asyncio.StreamWriter = writer
+        self.queue: list[bytes] = []
+        self.ready: asyncio.Event = asyncio.Event()
+        self.closed: bool = False
+        self.too_slow: bool = False
+
+
+class EventChannel:
+    """
+    Broadcast channel for Server-Sent Events.
+    Each published event is serialized once and queued to every subscriber. Subscribers which already have
+    `max_pending` events waiting to be sent are too slow to keep up and get disconnected.
+    Idle subscribers are sent a comment every `heartbeat` seconds, so clients which went away are noticed.
+    """
+
+    def __init__(self, max_pending: int = _MAX_PENDING, heartbeat: int = _HEARTBEAT):
+        self.max_pending: int = max_pending
+        self.heartbeat: int = heartbeat
+        self.subscribers: list[_Subscriber] = []
+        self.dropped: int = 0
+
+    def publish(
+        self,
+        data: str | bytes,
+        *,
+        event: Union[str, None] = None,
+        id: Union[str, None] = None,
+    ) -> None:
+        chunk = format_event(data, event, id)
+
+        for subscriber in self.subscribers[:]:
+            if len(subscriber.queue) >= self.max_pending:
+                subscriber.too_slow = True
+                subscriber.queue.clear()
+                self._drop(subscriber)
+                self.dropped += 1
+
+            else:
+                subscriber.queue.append(chunk)
+                subscriber.ready.set()
+
+    def close(self) -> None:
+        """End the event stream for all subscribers, they may then reuse their connection"""
+        for subscriber in self.subscribers[:]:
+            self._drop(subscriber)
+
+    def _drop(self, subscriber: _Subscriber) -> None:
+        subscriber.closed = True
+        subscriber.ready.set()
+        self.subscribers.remove(subscriber)
+
+        if subscriber.too_slow:
+            # its stream may be blocked writing to the client, closing the connection is the only way to end it
+            subscriber.writer.close()
+
+    async def stream(self, writer: asyncio.StreamWriter) -> None:
+        subscriber = _Subscriber(writer)
+        self.subscribers.append(subscriber)
+
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.ready.wait(), self.heartbeat)
+
+                except asyncio.TimeoutError:
+                    # writing to a dead client fails, ending the subscription
+                    writer.write(_PING)
+                    await writer.drain()
+                    continue
+
+                subscriber.ready.clear()
+
+                while subscriber.queue:
+                    writer.write(subscriber.queue.pop(0))
+                    await writer.drain()
+
+                if subscriber.too_slow:
+                    raise OSError("Client too slow, dropped from event stream")
+
+                if subscriber.closed:
+                    return
+
+        finally:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+
+
+class EventStream(Response):
+    buffered: bool = False  # the stream lasts as long as the subscription, don't hold a pooled buffer
+
+    def __init__(self, channel: EventChannel):
+        super().__init__(
+            Version(1, 1),
+            Code.s200,
+            {
+                Header.ContentType: MIMEType.event_stream,  # pyright: ignore[reportArgumentType]
+                Header.CacheControl: Header.CacheControlV.NoCache,
+                Header.Connection: Header.ConnectionV.KeepAlive,
+                Header.TransferEncoding: Header.TransferEncodingV.Chunked,
+            },
+            b"",
+        )
+        self.channel: EventChannel = channel
+
+    def can_compress(self, min_size: int) -> bool:
+        return False
+
+    async def send(
+        self,
+        writer: asyncio.StreamWriter,
+        buf: Union[bytearray, None] = None,
+        encoding: Union[bytes, None] = None,
+        wbits: int = 0,
+    ) -> None:
+        # the head is small, the default buffer would be kept alive for as long as the stream lasts
+        await self._send_head(writer, bytearray(_HEAD_BUF_SIZE))
+        await self.channel.stream(writer)
+        await end_chunks(writer)
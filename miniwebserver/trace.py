@@ -0,0 +1,119 @@
+import sys
+import time
+from micropython import const
+
+from miniwebserver.config import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Union
+    from miniwebserver.enums import Method
+
+if hasattr(time, "ticks_us"):
+    ticks_us = time.ticks_us  # pyright: ignore[reportAttributeAccessIssue]
+    ticks_diff = time.ticks_diff  # pyright: ignore[reportAttributeAccessIssue]
+
+else:
+    # Unix port / CPython
+
+    def ticks_us() -> int:
+        return time.perf_counter_ns() // 1000
+
+    def ticks_diff(end: int, start: int) -> int:
+        return end - start
+
+
+_CAPACITY = const(8)
+_SLOW_US = const(100_000)
+
+
+class RequestTrace:
+    """Durations, in microseconds, of the phases of handling one request"""
+
+    def __init__(self):
+        self.start: int = ticks_us()
+        self.last: int = self.start
+        self.method: str = ""
+        self.path: str = ""
+        self.phases: list[tuple[str, int]] = []
+        self.total: int = 0
+
+    def begin(self) -> None:
+        """Restart timing, once the request has started arriving"""
+        self.start = self.last = ticks_us()
+
+    def mark(self, phase: str) -> None:
+        now = ticks_us()
+        self.phases.append((phase, ticks_diff(now, self.last)))
+        self.last = now
+
+    def as_dict(self) -> dict[str, "Any"]:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "total_us": self.total,
+            "phases": dict(self.phases),
+        }
+
+
+class Tracer:
+    """
+    Opt-in request tracing: times the phases of one request out of every `sample_every`, and keeps the last
+    `capacity` requests slower than `slow_us` in a ring buffer.
+    """
+
+    def __init__(
+        self,
+        capacity: int = _CAPACITY,
+        slow_us: int = _SLOW_US,
+        sample_every: int = 1,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+
+        self.slow_us: int = slow_us
+        self.sample_every: int = sample_every
+        self.ring: list[Union[RequestTrace, None]] = [None] * capacity
+        self.next: int = 0
+        self.seen: int = 0
+        self.callbacks: list[Callable[[RequestTrace], None]] = []
+
+    def start(self) -> Union[RequestTrace, None]:
+        self.seen += 1
+        if self.seen % self.sample_every:
+            return None
+
+        return RequestTrace()
+
+    def finish(self, trace: RequestTrace, method: "Method", path: str) -> None:
+        trace.total = ticks_diff(trace.last, trace.start)
+        if trace.total < self.slow_us:
+            return
+
+        trace.method = method.decode()  # pyright: ignore[reportAttributeAccessIssue]
+        trace.path = path
+        self.ring[self.next] = trace
+        self.next = (self.next + 1) % len(self.ring)
+
+        for callback in self.callbacks:
+            # a failing callback must not take down the connection of the request being traced
+            try:
+                callback(trace)
+
+            except Exception as err:
+                print("[Warning] Slow request callback failed:", file=sys.stderr)
+                sys.print_exception(err, sys.stderr)  # pyright: ignore[reportAttributeAccessIssue]
+
+    def on_slow(
+        self, callback: Callable[[RequestTrace], None]
+    ) -> Callable[[RequestTrace], None]:
+        """Register a callback called with every slow request trace, can be used as a decorator"""
+        self.callbacks.append(callback)
+        return callback
+
+    def slow_requests(self) -> list[RequestTrace]:
+        """Recorded slow requests, from oldest to newest"""
+        ordered = self.ring[self.next :] + self.ring[: self.next]
+        return [trace for trace in ordered if trace is not None]
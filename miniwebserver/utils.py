@@ -3,12 +3,95 @@ import sys
 
 from miniwebserver.enums import FILE_MARKER
 
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+
 
 def get_media_types(MIME_type: str) -> list[str]:
     types = [t.split(";q=") if ";" in t else (t, 1) for t in MIME_type.split(",")]
     return [t for (t, _) in sorted(types, key=lambda x: float(x[1]))]
 
 
+def accepts_encoding(accept_encoding: bytes, encoding: bytes) -> bool:
+    """Whether an Accept-Encoding header value lists `encoding`, or `*`, with a non-zero q-value"""
+    any_accepted = False
+
+    for item in accept_encoding.split(b","):
+        token, _, params = item.partition(b";")
+        token = token.strip().lower()
+        if token != encoding and token != b"*":
+            continue
+
+        q = 1.0
+        for param in params.split(b";"):
+            name, _, value = param.partition(b"=")
+            if name.strip().lower() == b"q":
+                try:
+                    q = float(value)
+
+                except ValueError:
+                    q = 0.0
+
+        if token == encoding:
+            # an explicit entry takes precedence over `*`
+            return q > 0
+
+        any_accepted = q > 0
+
+    return any_accepted
+
+
+def etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    """Whether an If-None-Match header value lists `etag`, comparing weakly"""
+    for tag in if_none_match.split(b","):
+        tag = tag.strip()
+        if tag == b"*" or (tag[2:] if tag.startswith(b"W/") else tag) == etag:
+            return True
+
+    return False
+
+
+def unquote(value: str, plus: bool = True) -> str:
+    """
+    Decode %-escaped characters and, when `plus` is set, '+' signs from URL parts.
+    Values which don't decode to valid UTF-8 are returned unchanged.
+    """
+    if "%" not in value and not (plus and "+" in value):
+        return value
+
+    parts = (value.replace("+", " ") if plus else value).split("%")
+    decoded = bytearray(parts[0].encode())
+
+    for part in parts[1:]:
+        # int() would also take a single digit, a sign or spaces, only decode two hex digits
+        if len(part) >= 2 and part[0] in _HEX_DIGITS and part[1] in _HEX_DIGITS:
+            decoded.append(int(part[:2], 16))
+            decoded.extend(part[2:].encode())
+
+        else:
+            decoded.extend(b"%" + part.encode())
+
+    try:
+        return bytes(decoded).decode()
+
+    except UnicodeError:
+        return value
+
+
+def parse_pairs(string: str, separator: str, plus: bool = True) -> dict[str, str]:
+    """
+    Parse `name=value` pairs, as found in query strings and cookies.
+    '+' only stands for a space in query strings, cookies are parsed with `plus=False`.
+    """
+    pairs: dict[str, str] = {}
+
+    for pair in string.split(separator):
+        name, _, value = pair.strip().partition("=")
+        if name:
+            pairs[unquote(name, plus)] = unquote(value, plus)
+
+    return pairs
+
+
 def html_document(title: str, *, head: str = "", body: str = "") -> bytes:
     return b"""<!doctype html>
 <html lang="en">
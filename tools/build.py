@@ -0,0 +1,78 @@
+"""
+Cross-compile the miniwebserver package to .mpy files, to copy on the device instead of the sources.
+Precompiled modules skip compilation at import, which shortens boot time and lowers peak RAM usage.
+This script runs on the host machine and needs `mpy-cross`, matching the device's MicroPython version.
+
+Usage: python tools/build.py [--output build] [--mpy-cross mpy-cross] [--march xtensawin] [-O 1]
+
+To freeze the package into a firmware instead, see manifest.py at the root of the repository.
+"""
+
+import argparse
+import os
+import subprocess
+
+PACKAGE = "miniwebserver"
+
+
+def build(output: str, mpy_cross: str, march: str | None, optimize: int) -> list[str]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    built: list[str] = []
+
+    for directory, _, files in os.walk(os.path.join(root, PACKAGE)):
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+
+            source = os.path.join(directory, name)
+            module = os.path.relpath(source, root)
+            target = os.path.join(output, module[:-3] + ".mpy")
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+
+            command = [
+                mpy_cross,
+                "-o",
+                target,
+                "-s",
+                module.replace(os.sep, "/"),
+                "-O%d" % optimize,
+            ]
+            if march is not None:
+                command.append("-march=%s" % march)
+
+            _ = subprocess.run(command + [source], check=True)
+            built.append(target)
+
+    return built
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Cross-compile MiniWebServer to .mpy files"
+    )
+    _ = parser.add_argument(
+        "--output", default="build", help="folder to write .mpy files to"
+    )
+    _ = parser.add_argument(
+        "--mpy-cross", default="mpy-cross", help="path to the mpy-cross executable"
+    )
+    _ = parser.add_argument(
+        "--march",
+        default=None,
+        help="target architecture, enables native code emitters",
+    )
+    _ = parser.add_argument(
+        "-O",
+        dest="optimize",
+        type=int,
+        default=1,
+        help="optimization level, >=1 drops asserts",
+    )
+    args = parser.parse_args()
+
+    built = build(args.output, args.mpy_cross, args.march, args.optimize)
+    print("Compiled {0} modules into {1}/{2}".format(len(built), args.output, PACKAGE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Pack a folder of static files into a single asset bundle, to be served with `WebServer(asset_bundle=...)`.
+This script runs on the host machine (CPython), not on the device.
+
+Bundle layout (must match miniwebserver/bundle.py):
+    b"MWSB" | index length (uint32, little endian) | index (JSON) | file contents
+
+The index maps each file path, relative to the packed folder, to
+    [offset, length, extension, etag, gzip offset, gzip length]
+where offsets are from the start of the file contents and the gzip variant is absent (0, 0) when not smaller than the file.
+
+Usage: python tools/pack_assets.py src assets.bundle [--gzip]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import struct
+
+MAGIC = b"MWSB"
+
+
+def collect(folder: str) -> list[str]:
+    paths: list[str] = []
+
+    for root, _, files in os.walk(folder):
+        for name in files:
+            paths.append(
+                os.path.relpath(os.path.join(root, name), folder).replace(os.sep, "/")
+            )
+
+    return sorted(paths)
+
+
+def pack(
+    folder: str, output: str, compress: bool = False
+) -> dict[str, list[int | str]]:
+    contents: list[bytes] = []
+    entries: dict[str, list[int | str]] = {}
+    offset = 0
+
+    for path in collect(folder):
+        with open(os.path.join(folder, path), "rb") as file:
+            data = file.read()
+
+        _, _, extension = path.rpartition("/")[2].rpartition(".")
+        etag = '"%s"' % hashlib.sha1(data).hexdigest()[:16]
+        entry: list[int | str] = [offset, len(data), extension, etag, 0, 0]
+        contents.append(data)
+        offset += len(data)
+
+        if compress:
+            compressed = gzip.compress(data, mtime=0)
+            if len(compressed) < len(data):
+                entry[4:] = [offset, len(compressed)]
+                contents.append(compressed)
+                offset += len(compressed)
+
+        entries[path] = entry
+
+    index = json.dumps(entries, separators=(",", ":")).encode()
+
+    with open(output, "wb") as bundle:
+        _ = bundle.write(MAGIC)
+        _ = bundle.write(struct.pack("<I", len(index)))
+        _ = bundle.write(index)
+        for data in contents:
+            _ = bundle.write(data)
+
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Pack static files into a MiniWebServer asset bundle"
+    )
+    _ = parser.add_argument(
+        "folder", help="folder of static files, usually the web server's source_folder"
+    )
+    _ = parser.add_argument("output", help="path of the bundle file to write")
+    _ = parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="also store gzip variants of files when smaller",
+    )
+    args = parser.parse_args()
+
+    entries = pack(args.folder, args.output, args.gzip)
+    print(
+        "Packed {0} files into {1} ({2} bytes)".format(
+            len(entries), args.output, os.path.getsize(args.output)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Measure the import time and heap usage of miniwebserver on the device:
+
+    mpremote run tools/startup_report.py
+
+Importing any submodule runs the package's __init__, which imports the whole core (server, http, enums, ...): the
+core is reported as a single line, followed by each optional module, which only accounts for the module itself. Works
+with sources as well as precompiled .mpy files (see tools/build.py), to compare both.
+"""
+
+import gc
+import time
+
+MODULES = (
+    # the package and every module it imports
+    "miniwebserver",
+    # optional modules, only imported when their feature is used
+    "miniwebserver.sse",
+    "miniwebserver.trace",
+    "miniwebserver.compression",
+    "miniwebserver.bundle",
+    "miniwebserver.proxy",
+    "miniwebserver.template",
+    "json",
+)
+
+
+def main() -> None:
+    print("{0:<30} {1:>10} {2:>10}".format("module", "time (ms)", "heap (B)"))
+    total_time = total_heap = 0
+
+    for module in MODULES:
+        _ = gc.collect()
+        heap = gc.mem_alloc()  # pyright: ignore[reportAttributeAccessIssue]
+        start = time.ticks_ms()  # pyright: ignore[reportAttributeAccessIssue]
+
+        _ = __import__(module)
+
+        elapsed = time.ticks_diff(time.ticks_ms(), start)  # pyright: ignore[reportAttributeAccessIssue]
+        _ = gc.collect()
+        used = gc.mem_alloc() - heap  # pyright: ignore[reportAttributeAccessIssue]
+
+        total_time += elapsed
+        total_heap += used
+        print("{0:<30} {1:>10} {2:>10}".format(module, elapsed, used))
+
+    print("{0:<30} {1:>10} {2:>10}".format("total", total_time, total_heap))
+
+
+main()